@@ -5,16 +5,54 @@
 # ----- WARNING: This script relies on web scraping and may break
 # ----- if ufcstats.com changes its HTML structure.
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
 import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from lxml import etree
 import re # For cleaning text
+from concurrent.futures import ThreadPoolExecutor # For scraping both fighters at the same time
+import threading
+import json
+from html import escape # For putting fighter names into the SVG chart
+import time
+import os
+import pickle
 import sys # For exiting on error
+import importlib.util # For checking dependencies without importing them
 
 # --- 1. Web Scraping Functions ---
 
+# Pages are cached on disk (ufc_cache.sqlite) for a day, so repeated lookups don't hit ufcstats.com again
+_CACHE_EXPIRE_SECONDS = 86400
+_SESSION = requests_cache.CachedSession('ufc_cache', expire_after=_CACHE_EXPIRE_SECONDS)
+_SESSION.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'})
+# Every request goes to ufcstats.com, so keep a small pool of kept-alive connections to it
+_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# Patterns for the stats on a fighter's profile page, compiled once
+_RECORD_RE = re.compile(r'Record:\s*(\d+)-(\d+)-(\d+)')
+_SLPM_RE = re.compile(r'SLpM:\s*([\d.]+|--)')
+_STR_DEF_RE = re.compile(r'Str\. Def:\s*(\d+|--)%?')
+
+# Search names made only of these characters appear byte-for-byte in the A-Z page's link text
+# (anything else might be written as an HTML entity), so they can be searched for in the raw bytes
+_PLAIN_NAME_RE = re.compile(r"[a-z .\-]+")
+
+# Parser for single rows cut out of the A-Z page. A fragment has no <meta charset> for lxml to
+# read, so the encoding ufcstats.com serves (UTF-8) is given explicitly. lxml serializes use of
+# a shared parser between threads.
+_ROW_FRAGMENT_PARSER = etree.HTMLParser(encoding='utf-8')
+
+# Name -> profile URL index for each A-Z page, for this run and saved on disk
+_LETTER_INDEX_FILE = 'ufc_cache_index.json'
+_LETTER_INDEXES = {}
+_LETTER_INDEX_LOCK = threading.Lock()
+
+# Already-parsed fighter data (stats + fight history), pickled per fighter
+_FIGHTER_CACHE_DIR = 'ufc_cache_fighters'
+
 def get_fighter_profile_url(fighter_name):
     """
     Finds the ufcstats.com profile URL for a given fighter.
@@ -34,54 +72,210 @@ def get_fighter_profile_url(fighter_name):
         print(f"Error: Invalid name '{fighter_name}'")
         return None
 
+    # Names already seen on this letter's page are a single dict lookup
+    letter_index = _get_letter_index(last_name_letter)
+    profile_url = letter_index['fighters'].get(search_name)
+    if profile_url:
+        return profile_url
+
+    # Only read the page again if the saved index stopped part-way through it
+    if not letter_index['complete']:
+        letter_index = _scan_letter_page(last_name_letter, search_name, letter_index)
+        if letter_index is None:
+            return None
+        _save_letter_index(last_name_letter, letter_index)
+
+        profile_url = letter_index['fighters'].get(search_name)
+        if profile_url:
+            return profile_url
+
+    print(f"Warning: Could not find profile for '{fighter_name}'.")
+    return None
+
+def _get_letter_index(letter):
+    """
+    Returns the index for one A-Z page as {'fetched': time, 'complete': bool, 'fighters': {full name: profile URL}}.
+
+    Indexes are kept in memory for the run and saved to disk (next to the HTTP cache) for a day.
+    'complete' is False when the scan stopped early at a match, so names not in 'fighters' may
+    still be further down the page. A letter with no usable index gets an empty, incomplete one.
+    """
+    with _LETTER_INDEX_LOCK:
+        letter_index = _LETTER_INDEXES.get(letter)
+        if letter_index is None:
+            letter_index = _load_saved_letter_indexes().get(letter)
+            # Keep an unexpired saved index in memory, so later lookups don't re-read the file
+            if letter_index is not None and time.time() - letter_index['fetched'] < _CACHE_EXPIRE_SECONDS:
+                _LETTER_INDEXES[letter] = letter_index
+
+    if letter_index is None or time.time() - letter_index['fetched'] >= _CACHE_EXPIRE_SECONDS:
+        return {'fetched': time.time(), 'complete': False, 'fighters': {}}
+    return letter_index
+
+def _scan_letter_page(letter, stop_at, letter_index):
+    """
+    Reads the A-Z page for a letter, adding fighters' lowercased "first last" names and profile URLs
+    to letter_index, and stops as soon as the fighter named stop_at is found.
+
+    Returns the updated index (same format as _get_letter_index), or None if the page can't be read.
+    """
     # This is the URL for the A-Z list. We use page=all to get everyone on one page.
-    search_url = f"http://ufcstats.com/statistics/fighters?char={last_name_letter}&page=all"
-    
+    search_url = f"http://ufcstats.com/statistics/fighters?char={letter}&page=all"
+
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
-        response = requests.get(search_url, headers=headers)
+        response = _SESSION.get(search_url)
         response.raise_for_status() # Check for errors (like 404)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching fighter list: {e}")
         return None
 
-    # Parse the HTML
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
-    # --- NEW LOGIC ---
-    # Find the table body that contains all the fighter rows
-    table_body = soup.find('tbody')
-    
-    if not table_body:
-        print(f"Error: Could not find fighter table on page for letter '{last_name_letter}'.")
+    if _PLAIN_NAME_RE.fullmatch(stop_at):
+        # Only the rows mentioning the last name can match, so just those get parsed.
+        # None of them matching means the fighter isn't on the page, but the rest of
+        # the page is still unindexed, so 'complete' stays as it was.
+        page_bytes = response.content
+        lowered = page_bytes.lower()
+        if lowered.find(b'<tbody') < 0:
+            print(f"Error: Could not find fighter table on page for letter '{letter}'.")
+            return None
+
+        fighters = dict(letter_index['fighters'])
+        for row in _candidate_rows(page_bytes, lowered, stop_at):
+            fighter = _read_fighter_row(row)
+            if fighter and fighter[0]:
+                fighters.setdefault(*fighter)
+        return {'fetched': letter_index['fetched'], 'complete': letter_index['complete'], 'fighters': fighters}
+
+    # Otherwise, parse the page row by row and stop at the match. Start from the names already
+    # indexed, so rows found further down by earlier scans aren't lost if this one stops early.
+    found_table = False
+    fighters = dict(letter_index['fighters'])
+
+    for row in _iter_streamed_rows(response):
+        fighter = _read_fighter_row(row)
+        if fighter is None:
+            continue
+        found_table = True
+        full_name, profile_url = fighter
+        if full_name:
+            # Keep the first row if a name repeats
+            fighters.setdefault(full_name, profile_url)
+            if full_name == stop_at:
+                return {'fetched': time.time(), 'complete': False, 'fighters': fighters}
+
+    if not found_table:
+        print(f"Error: Could not find fighter table on page for letter '{letter}'.")
         return None
-        
-    rows = table_body.find_all('tr')
-    
-    for row in rows:
-        # Find all columns in this row
-        cols = row.find_all('td')
-        
-        # Ensure the row has enough columns (at least 2 for names)
-        if len(cols) > 1:
-            first_name_link = cols[0].find('a')
-            last_name_link = cols[1].find('a')
-            
-            # Check if both name links exist
-            if first_name_link and last_name_link:
-                first_name = first_name_link.get_text(strip=True).lower()
-                last_name = last_name_link.get_text(strip=True).lower()
-                full_name = f"{first_name} {last_name}"
-                
-                # Compare the constructed full name with our search name
-                if full_name == search_name:
-                    # Found it! Return the link's URL (href)
-                    # Both links point to the same profile.
-                    return first_name_link.get('href')
-            
-    # If the loop finishes without finding a match
-    print(f"Warning: Could not find profile for '{fighter_name}'.")
-    return None
+
+    return {'fetched': time.time(), 'complete': True, 'fighters': fighters}
+
+def _candidate_rows(page_bytes, lowered, search_name):
+    """
+    Finds the last name of search_name as link text in the raw page bytes (lowered is
+    page_bytes.lower()) and parses only the <tr> rows around those hits, instead of the whole page.
+    """
+    last_word = search_name.split(' ')[-1].encode()
+    # The word ends the link text, which may have other words before it (e.g., "dos Santos")
+    link_text_re = re.compile(rb'>[^<]*' + re.escape(last_word) + rb'\s*</a>')
+
+    row_starts = set()
+    for match in link_text_re.finditer(lowered):
+        start = lowered.rfind(b'<tr', 0, match.start())
+        end = lowered.find(b'</tr>', match.end())
+        if start < 0 or end < 0 or start in row_starts:
+            continue
+        row_starts.add(start)
+
+        fragment = etree.fromstring(page_bytes[start:end + len(b'</tr>')], _ROW_FRAGMENT_PARSER)
+        yield from fragment.iter('tr')
+
+def _read_fighter_row(row):
+    """
+    Returns (lowercased "first last" name, profile URL) for a fighter table row.
+
+    The name and URL are None if the row doesn't have both name links, and None is returned
+    instead of a tuple if the row isn't a fighter table row at all.
+    """
+    cols = row.findall('td')
+
+    # Ensure the row has enough columns (at least 2 for names)
+    if len(cols) < 2:
+        return None
+
+    first_name_link = cols[0].find('.//a')
+    last_name_link = cols[1].find('.//a')
+
+    # Check if both name links exist
+    if first_name_link is None or last_name_link is None:
+        return None, None
+
+    first_name = _link_text(first_name_link)
+    last_name = _link_text(last_name_link)
+    if not first_name or not last_name:
+        return None, None
+
+    # Both links point to the same profile
+    return f"{first_name} {last_name}", first_name_link.get('href')
+
+def _iter_streamed_rows(response):
+    """
+    Feeds the page body into an HTML pull parser in chunks and yields each <tr> as soon as it's parsed,
+    so the caller can stop parsing once it has the row it wants. (The cached session has already read
+    the whole body by this point, so stopping early saves parse time, not download time.)
+
+    Each row (and the ones before it) is freed once the caller moves on, so only one row is held in memory.
+    """
+    parser = etree.HTMLPullParser(events=('end',), tag='tr')
+
+    for chunk in response.iter_content(chunk_size=8192):
+        parser.feed(chunk)
+        for _, row in parser.read_events():
+            yield row
+            _free_row(row)
+
+    parser.close()
+    for _, row in parser.read_events():
+        yield row
+        _free_row(row)
+
+def _free_row(row):
+    """
+    Clears a parsed table row and removes the rows before it from the tree.
+    """
+    row.clear()
+    while row.getprevious() is not None:
+        del row.getparent()[0]
+
+def _load_saved_letter_indexes():
+    """
+    Reads the saved letter indexes, or returns {} if there are none yet.
+    """
+    try:
+        with open(_LETTER_INDEX_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_letter_index(letter, letter_index):
+    """
+    Stores one letter's index for this run and in the saved indexes file.
+    """
+    with _LETTER_INDEX_LOCK:
+        _LETTER_INDEXES[letter] = letter_index
+        saved = _load_saved_letter_indexes()
+        saved[letter] = letter_index
+        try:
+            with open(_LETTER_INDEX_FILE, 'w') as f:
+                json.dump(saved, f)
+        except OSError as e:
+            # The saved index is only a shortcut for next time, so carry on without it
+            print(f"Warning: Could not save fighter index for letter '{letter}': {e}")
+
+def _link_text(link):
+    """
+    Returns the cleaned-up, lowercased text of an <a> element.
+    """
+    return ''.join(link.itertext()).strip().lower()
 
 def get_stats_from_profile(profile_url, fighter_name):
     """
@@ -89,61 +283,48 @@ def get_stats_from_profile(profile_url, fighter_name):
     """
     if profile_url is None:
         # Return empty stats and empty history
-        return {'Name': fighter_name, 'Wins': 0, 'Losses': 0, 'Draws': 0, 'SLpM': 0.0, 'Str_Def': 0}, []
+        return _default_fighter_data(fighter_name)
 
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
-        response = requests.get(profile_url, headers=headers)
+        response = _SESSION.get(profile_url)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print(f"Error fetching profile: {e}")
-        return {'Name': fighter_name, 'Wins': 0, 'Losses': 0, 'Draws': 0, 'SLpM': 0.0, 'Str_Def': 0}, []
+        return _default_fighter_data(fighter_name)
 
-    soup = BeautifulSoup(response.text, 'html.parser')
+    # Hand the raw bytes to the parser, which reads the page's own charset, instead of
+    # letting requests guess the encoding for response.text
+    soup = BeautifulSoup(response.content, 'lxml')
     stats_dict = {}
     opponent_history = [] # List to store (result, opponent_name) tuples
 
     try:
         # --- Get Record (Wins, Losses, Draws) ---
-        # This is the class for the record (e.g., "Record: 27-1-0")
+        # This is the class for the record (e.g., "Record: 27-1-0" or "Record: 11-3-0 (1 NC)")
         record_span = soup.find('span', class_='b-content__title-record')
-        record_text = record_span.get_text(strip=True).replace('Record: ', '')
-        # Split the record "27-1-0" or "11-3-0 (1 NC)" into parts
-        parts = record_text.split('-')
-        stats_dict['Wins'] = int(parts[0])
-        stats_dict['Losses'] = int(parts[1])
-        
-        # --- MODIFIED: Handle "No Contests" in record, e.g., "0 (1 NC)" ---
-        # We split the 'draws' part by a space and take the first element
-        draws_string = parts[2].split(' ')[0]
-        stats_dict['Draws'] = int(draws_string)
-        # --- END MODIFICATION ---
+        record_match = _RECORD_RE.search(record_span.get_text()) if record_span else None
+        if record_match is None:
+            raise ValueError("record not found")
+        stats_dict['Wins'] = int(record_match.group(1))
+        stats_dict['Losses'] = int(record_match.group(2))
+        stats_dict['Draws'] = int(record_match.group(3))
 
         # --- Get Striking Stats ---
-        # All stats are in <li> tags with this class
-        stat_items = soup.find_all('li', class_='b-list__box-list-item')
-        
+        # e.g., "SLpM: 2.63" and "Str. Def: 61%". Empty stats show as "--" and stay at 0.
         slpm = 0.0
         str_def = 0
-        
-        for item in stat_items:
-            text = item.get_text(strip=True)
-            if text.startswith('SLpM:'):
-                # Get the number, e.g., "SLpM: 2.63" -> "2.63"
-                slpm_text = text.split(':')[-1].strip()
-                # --- MODIFIED: Check for empty stats "--" ---
-                if slpm_text != '--':
-                    slpm = float(slpm_text)
-                # else, slpm remains 0.0
-                
-            elif text.startswith('Str. Def:'):
-                # Get the percentage, e.g., "Str. Def: 61%" -> "61"
-                str_def_text = text.split(':')[-1].strip().replace('%', '')
-                # --- MODIFIED: Check for empty stats "--" ---
-                if str_def_text != '--':
-                    str_def = int(str_def_text)
-                # else, str_def remains 0
-        
+
+        # Go straight to the two <li> stat items we need instead of scanning all of them
+        slpm_item = soup.select_one('li.b-list__box-list-item:-soup-contains("SLpM:")')
+        slpm_match = _SLPM_RE.search(slpm_item.get_text()) if slpm_item else None
+        if slpm_match and slpm_match.group(1) != '--':
+            slpm = float(slpm_match.group(1))
+
+        str_def_item = soup.select_one('li.b-list__box-list-item:-soup-contains("Str. Def:")')
+        str_def_match = _STR_DEF_RE.search(str_def_item.get_text()) if str_def_item else None
+        if str_def_match and str_def_match.group(1) != '--':
+            str_def = int(str_def_match.group(1))
+
         stats_dict['SLpM'] = slpm
         stats_dict['Str_Def'] = str_def
         stats_dict['Name'] = fighter_name
@@ -180,10 +361,170 @@ def get_stats_from_profile(profile_url, fighter_name):
     except Exception as e:
         print(f"Error parsing stats for {fighter_name}: {e}. Using default stats.")
         # Return default stats and empty history
-        return {'Name': fighter_name, 'Wins': 0, 'Losses': 0, 'Draws': 0, 'SLpM': 0.0, 'Str_Def': 0}, []
+        return _default_fighter_data(fighter_name)
 
     return stats_dict, opponent_history
 
+def _default_fighter_data(fighter_name):
+    """
+    Returns the empty stats and empty history used when a fighter can't be found or parsed.
+    """
+    return {'Name': fighter_name, 'Wins': 0, 'Losses': 0, 'Draws': 0, 'SLpM': 0.0, 'Str_Def': 0}, []
+
+def lookup_fighter(fighter_name):
+    """
+    Finds a fighter's profile and scrapes their stats and fight history.
+
+    Fighters scraped in the last day are loaded from disk instead, skipping both page fetches.
+    """
+    cached = _load_cached_fighter(fighter_name)
+    if cached is not None:
+        print(f"Using saved data for '{fighter_name}'.")
+        return cached
+
+    profile_url = get_fighter_profile_url(fighter_name)
+    # Pass the original, user-typed name (cleaned up) to get_stats_from_profile
+    display_name = fighter_name.strip().title()
+    fighter_data = get_stats_from_profile(profile_url, display_name)
+
+    # Only successfully scraped fighters are saved, never the default stats
+    if fighter_data != _default_fighter_data(display_name):
+        _save_cached_fighter(fighter_name, fighter_data)
+    return fighter_data
+
+def _fighter_cache_path(fighter_name):
+    """
+    Returns the pickle file path for a fighter, e.g. 'Jon Jones' -> ufc_cache_fighters/jon_jones.pkl
+    """
+    key = re.sub(r'\W+', '_', fighter_name.strip().lower()).strip('_')
+    return os.path.join(_FIGHTER_CACHE_DIR, f"{key}.pkl")
+
+def _load_cached_fighter(fighter_name):
+    """
+    Returns the saved (stats, opponent history) for a fighter, or None if missing or expired.
+    """
+    path = _fighter_cache_path(fighter_name)
+    try:
+        if time.time() - os.path.getmtime(path) >= _CACHE_EXPIRE_SECONDS:
+            return None
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+def _save_cached_fighter(fighter_name, fighter_data):
+    """
+    Saves a fighter's (stats, opponent history) so the next run can skip scraping them.
+    """
+    try:
+        os.makedirs(_FIGHTER_CACHE_DIR, exist_ok=True)
+        with open(_fighter_cache_path(fighter_name), 'wb') as f:
+            pickle.dump(fighter_data, f)
+    except OSError as e:
+        # The saved data is only a shortcut for next time, so carry on without it
+        print(f"Warning: Could not save data for '{fighter_name}': {e}")
+
+def lookup_fighters(*fighter_names):
+    """
+    Runs lookup_fighter for the fighters two at a time and returns the results in order.
+
+    Each lookup runs in its own worker thread (the GIL is released while waiting on the network),
+    so the fetches for different fighters overlap.
+    """
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        return list(pool.map(lookup_fighter, fighter_names))
+
+def save_bar_chart_svg(names, likelihoods, colors, filename):
+    """
+    Writes the prediction likelihood bar chart (0-100%) as a small SVG file.
+
+    Two bars don't need a full plotting library, so the SVG is written by hand.
+    """
+    width, height = 800, 600
+    left, right, top, bottom = 90, 760, 70, 520  # Edges of the plot area
+    plot_height = bottom - top
+    slot_width = (right - left) / len(names)
+    bar_width = slot_width * 0.6
+
+    def y_for(value):
+        return bottom - (value / 100) * plot_height
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="sans-serif">',
+        f'<rect width="{width}" height="{height}" fill="white"/>',
+        f'<text x="{width / 2}" y="40" text-anchor="middle" font-size="18" font-weight="bold">'
+        f'UFC Fight Prediction Likelihood</text>',
+    ]
+
+    # Dashed horizontal grid lines and y-axis labels every 20%
+    for tick in range(0, 101, 20):
+        y = y_for(tick)
+        parts.append(f'<line x1="{left}" y1="{y}" x2="{right}" y2="{y}" stroke="#b0b0b0" '
+                     f'stroke-dasharray="6,4" opacity="0.7"/>')
+        parts.append(f'<text x="{left - 10}" y="{y + 5}" text-anchor="end" font-size="13">{tick}</text>')
+
+    # One bar per fighter, with its likelihood written above it
+    for i, (name, likelihood, color) in enumerate(zip(names, likelihoods, colors)):
+        x = left + i * slot_width + (slot_width - bar_width) / 2
+        y = y_for(likelihood)
+        center = x + bar_width / 2
+        parts.append(f'<rect x="{x}" y="{y}" width="{bar_width}" height="{bottom - y}" fill="{color}"/>')
+        parts.append(f'<text x="{center}" y="{y - 8}" text-anchor="middle" font-size="16" '
+                     f'font-weight="bold">{likelihood}%</text>')
+        parts.append(f'<text x="{center}" y="{bottom + 25}" text-anchor="middle" font-size="14">'
+                     f'{escape(name)}</text>')
+
+    # Axes and axis titles
+    parts.append(f'<line x1="{left}" y1="{bottom}" x2="{right}" y2="{bottom}" stroke="black"/>')
+    parts.append(f'<line x1="{left}" y1="{top}" x2="{left}" y2="{bottom}" stroke="black"/>')
+    parts.append(f'<text x="{(left + right) / 2}" y="{bottom + 60}" text-anchor="middle" font-size="15">Fighter</text>')
+    parts.append(f'<text x="30" y="{(top + bottom) / 2}" text-anchor="middle" font-size="15" '
+                 f'transform="rotate(-90 30 {(top + bottom) / 2})">Prediction Likelihood (%)</text>')
+    parts.append('</svg>')
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(parts) + '\n')
+
+def score(slpm, str_def, win_rate, common_score):
+    """
+    Scores N fights at once. Every argument is an (N, 2) array-like with one row per fight
+    and one column per fighter:
+      slpm         - significant strikes landed per minute
+      str_def      - striking defense (%)
+      win_rate     - win rate (%)
+      common_score - wins over common opponents the other fighter lost to
+
+    Returns (effective_strikes, likelihoods), both (N, 2) NumPy arrays, with the likelihoods in %
+    rounded to 2 decimals. Everything is done with whole-array NumPy operations, so scoring a full
+    fight card costs about the same as scoring one fight.
+    """
+    import numpy as np
+
+    slpm = np.asarray(slpm, dtype=float)
+    str_def = np.asarray(str_def, dtype=float)
+    win_rate = np.asarray(win_rate, dtype=float)
+    common_score = np.asarray(common_score, dtype=float)
+
+    def split(values):
+        # Each fighter's share of their fight's total, or a 50/50 split if the total is 0
+        total = values.sum(axis=1, keepdims=True)
+        return np.divide(values, total, out=np.full_like(values, 0.5), where=total != 0)
+
+    # Striking Differential: strikes landed that get past the *opponent's* defense
+    effective_strikes = slpm * (1 - str_def[:, ::-1] / 100)
+
+    weight_win_rate = 0.5     # 50%
+    weight_striking = 0.3     # 30%
+    weight_common_opp = 0.2   # 20%
+
+    prediction_score = (win_rate * weight_win_rate) + \
+                       (split(effective_strikes) * 100 * weight_striking) + \
+                       (split(common_score) * 100 * weight_common_opp)
+
+    likelihoods = np.round(split(prediction_score) * 100, 2)
+    return effective_strikes, likelihoods
+
 
 # --- 2. Main Program Logic ---
 def main():
@@ -198,39 +539,21 @@ def main():
     fighter2_name = input("Enter the full name for Fighter 2: ")
     print("\n--- Scraping Data (This may take a moment) ---")
 
-    # --- Get data from the web ---
-    f1_url = get_fighter_profile_url(fighter1_name)
-    # Pass the original, user-typed name (cleaned up) to get_stats_from_profile
-    fighter1_data, f1_opp_history = get_stats_from_profile(f1_url, fighter1_name.strip().title())
-    
-    f2_url = get_fighter_profile_url(fighter2_name)
-    # Pass the original, user-typed name (cleaned up) to get_stats_from_profile
-    fighter2_data, f2_opp_history = get_stats_from_profile(f2_url, fighter2_name.strip().title())
+    # --- Get data from the web (both fighters are scraped concurrently) ---
+    (fighter1_data, f1_opp_history), (fighter2_data, f2_opp_history) = lookup_fighters(fighter1_name, fighter2_name)
     print("--- Scraping Complete ---\n")
 
     # Use the 'Name' from the data we received
     fighter1_name = fighter1_data['Name']
     fighter2_name = fighter2_data['Name']
 
-    # Create DataFrame for easy manipulation
-    df = pd.DataFrame([fighter1_data, fighter2_data])
-
     # --- 3. Simple Analytics / Model ---
 
     # Win Rate (%)
-    df['Total_Fights'] = df['Wins'] + df['Losses'] + df['Draws']
-    df['Win_Rate'] = np.where(df['Total_Fights'] > 0,
-                              (df['Wins'] / df['Total_Fights']) * 100,
-                              0)
-
-    # Striking Differential
-    f1_slpm = df.loc[0, 'SLpM']
-    f2_slpm = df.loc[1, 'SLpM']
-    f1_def = df.loc[0, 'Str_Def'] / 100
-    f2_def = df.loc[1, 'Str_Def'] / 100
-
-    f1_effective_strikes = f1_slpm * (1 - f2_def)
-    f2_effective_strikes = f2_slpm * (1 - f1_def)
+    for fighter_data in (fighter1_data, fighter2_data):
+        total_fights = fighter_data['Wins'] + fighter_data['Losses'] + fighter_data['Draws']
+        fighter_data['Total_Fights'] = total_fights
+        fighter_data['Win_Rate'] = (fighter_data['Wins'] / total_fights) * 100 if total_fights > 0 else 0.0
 
     # --- NEW: Common Opponent Logic ---
     # Create dictionaries for easier lookup: {'opponent_name': 'result'}
@@ -263,51 +586,17 @@ def main():
             report_str += f" (Both {f1_result})"
         common_opp_report.append(report_str)
 
-    # Create a ratio for the common opponent score
-    total_common_score = f1_common_score + f2_common_score
-    if total_common_score == 0:
-        f1_common_ratio = 0.5  # If no score, it's a 50/50 split
-        f2_common_ratio = 0.5
-    else:
-        f1_common_ratio = f1_common_score / total_common_score
-        f2_common_ratio = f2_common_score / total_common_score
-    
     # --- END: Common Opponent Logic ---
 
-    # Weighted Prediction Score
-    f1_win_rate = df.loc[0, 'Win_Rate']
-    f2_win_rate = df.loc[1, 'Win_Rate']
-
-    total_effective_strikes = f1_effective_strikes + f2_effective_strikes
-    if total_effective_strikes == 0:
-        f1_strike_ratio = 0.5
-        f2_strike_ratio = 0.5
-    else:
-        f1_strike_ratio = f1_effective_strikes / total_effective_strikes
-        f2_strike_ratio = f2_effective_strikes / total_effective_strikes
-
-    # --- MODIFIED: Adjusted weights for 3 factors ---
-    weight_win_rate = 0.5     # 50%
-    weight_striking = 0.3     # 30%
-    weight_common_opp = 0.2   # 20%
-
-    f1_prediction_score = (f1_win_rate * weight_win_rate) + \
-                          (f1_strike_ratio * 100 * weight_striking) + \
-                          (f1_common_ratio * 100 * weight_common_opp)
-                              
-    f2_prediction_score = (f2_win_rate * weight_win_rate) + \
-                          (f2_strike_ratio * 100 * weight_striking) + \
-                          (f2_common_ratio * 100 * weight_common_opp)
-
-    total_score = f1_prediction_score + f2_prediction_score
-    if total_score == 0:
-        f1_likelihood = 50.0
-        f2_likelihood = 50.0
-        predicted_winner = "It's a perfect tie!"
-    else:
-        f1_likelihood = round((f1_prediction_score / total_score) * 100, 2)
-        f2_likelihood = round((f2_prediction_score / total_score) * 100, 2)
-        predicted_winner = fighter1_name if f1_likelihood > f2_likelihood else fighter2_name
+    # Weighted Prediction Score (score() works on whole fight cards, so this is a card of one fight)
+    card_effective_strikes, card_likelihoods = score(
+        slpm=[[fighter1_data['SLpM'], fighter2_data['SLpM']]],
+        str_def=[[fighter1_data['Str_Def'], fighter2_data['Str_Def']]],
+        win_rate=[[fighter1_data['Win_Rate'], fighter2_data['Win_Rate']]],
+        common_score=[[f1_common_score, f2_common_score]])
+    f1_effective_strikes, f2_effective_strikes = card_effective_strikes[0].tolist()
+    f1_likelihood, f2_likelihood = card_likelihoods[0].tolist()
+    predicted_winner = fighter1_name if f1_likelihood > f2_likelihood else fighter2_name
 
 
     # --- 4. Data Visualization ---
@@ -315,27 +604,17 @@ def main():
     likelihoods = [f1_likelihood, f2_likelihood]
     colors = ['#FF4500', '#1E90FF']
 
-    plt.figure(figsize=(8, 6))
-    bars = plt.bar(names, likelihoods, color=colors)
-
-    for bar in bars:
-        yval = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2, yval + 1, f'{yval}%', 
-                 ha='center', va='bottom', fontsize=12, fontweight='bold')
-
-    plt.ylim(0, 100)
-    plt.title('UFC Fight Prediction Likelihood', fontsize=14, fontweight='bold')
-    plt.ylabel('Prediction Likelihood (%)', fontsize=12)
-    plt.xlabel('Fighter', fontsize=12)
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    
-    plot_filename = "fight_prediction.png"
-    plt.savefig(plot_filename)
+    plot_filename = "fight_prediction.svg"
+    save_bar_chart_svg(names, likelihoods, colors, plot_filename)
     
 
     # --- 5. Summary Report ---
     print("\n================ UFC FIGHT PREDICTION REPORT ================\n")
     print_columns = ['Name', 'Wins', 'Losses', 'Draws', 'Win_Rate', 'SLpM', 'Str_Def']
+    # The DataFrame is only built here, to get a neatly aligned table.
+    # pandas is imported here too, so the scraping functions don't pay for importing it.
+    import pandas as pd
+    df = pd.DataFrame([fighter1_data, fighter2_data])
     print(df[print_columns].to_string(index=False))
     print("\n-------------------------------------------------------------")
     
@@ -360,11 +639,17 @@ if __name__ == "__main__":
     try:
         import requests
         import bs4
+        import lxml
+        import requests_cache
+        # pandas and numpy are only imported once the report is built, so just check they're installed
+        for module_name in ('pandas', 'numpy'):
+            if importlib.util.find_spec(module_name) is None:
+                raise ImportError(module_name)
     except ImportError:
         print("="*50)
         print("ERROR: Missing required libraries.")
         print("Please run this command in your terminal:")
-        print("pip install requests beautifulsoup4")
+        print("pip install requests beautifulsoup4 lxml requests-cache pandas numpy")
         print("="*50)
         sys.exit(1) # Exit the script
         